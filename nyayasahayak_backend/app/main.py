@@ -1,10 +1,14 @@
+import json
+import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
 import os
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 
 from .modules.data_loader import DataLoader
 from .modules.embeddings import EmbeddingModel
@@ -17,10 +21,13 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
 app = FastAPI(
     title="NyayaSahayak Legal AI Backend",
     description="Advanced Legal AI Assistant with Agentic Reasoning and RAG",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Disable CORS. Do not remove this for full-stack development.
@@ -34,6 +41,7 @@ app.add_middleware(
 
 
 data_loader = None
+llm_client = None
 embedding_model = None
 retriever = None
 rag_agent = None
@@ -59,9 +67,19 @@ class SuggestionResponse(BaseModel):
     suggestions: List[str]
 
 
+SUGGESTIONS = [
+    "Compare the reasoning in Kesavananda Bharati and Minerva Mills on the Basic Structure Doctrine",
+    "Explain how the Supreme Court interpreted Article 21 in Puttaswamy",
+    "List cases where sedition laws under IPC Section 124A were challenged",
+    "Summarize how freedom of speech evolved under Article 19(1)(a)",
+    "Identify the ratio decidendi in Maneka Gandhi vs Union of India"
+]
+SUGGESTIONS_LOWER = [s.lower() for s in SUGGESTIONS]
+
+
 @app.on_event("startup")
 async def startup_event():
-    global data_loader, embedding_model, retriever, rag_agent, legal_workflow, system_initialized
+    global data_loader, llm_client, embedding_model, retriever, rag_agent, legal_workflow, system_initialized
     
     logger.info("Initializing NyayaSahayak backend...")
     
@@ -72,8 +90,18 @@ async def startup_event():
         
         api_key = os.getenv("OPENROUTER_API_KEY")
         
-        rag_agent = RAGAgent(retriever=retriever, api_key=api_key)
-        legal_workflow = LegalAgentWorkflow(retriever=retriever, api_key=api_key)
+        if api_key:
+            llm_client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=OPENROUTER_BASE_URL,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+                    timeout=60.0
+                )
+            )
+        
+        rag_agent = RAGAgent(retriever=retriever, client=llm_client)
+        legal_workflow = LegalAgentWorkflow(retriever=retriever, client=llm_client)
         
         if not retriever.collection_exists() or retriever.get_collection_count() == 0:
             logger.info("Vector database not found or empty. Indexing will be required.")
@@ -89,6 +117,14 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    global llm_client
+    
+    if llm_client:
+        await llm_client.close()
+
+
 @app.get("/healthz")
 async def healthz():
     return {"status": "ok"}
@@ -136,7 +172,7 @@ async def index_cases():
         
         logger.info(f"Loaded {len(cases)} cases from dataset")
         
-        retriever.index_cases(cases, chunk_size=1024)
+        retriever.index_cases(cases, chunk_overlap=32)
         
         system_initialized = True
         
@@ -170,10 +206,10 @@ async def process_legal_query(request: QueryRequest):
     try:
         if request.use_agentic and legal_workflow:
             logger.info("Processing query with agentic workflow")
-            result = legal_workflow.process_query(request.query)
+            result = await legal_workflow.process_query(request.query)
         else:
             logger.info("Processing query with simple RAG")
-            result = rag_agent.process_query(request.query)
+            result = await rag_agent.process_query(request.query)
         
         return QueryResponse(**result)
     
@@ -182,22 +218,55 @@ async def process_legal_query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/legal-query/stream")
+async def stream_legal_query(request: QueryRequest):
+    global legal_workflow, system_initialized
+    
+    if not system_initialized:
+        raise HTTPException(
+            status_code=503, 
+            detail="System not ready. Please index the cases first by calling POST /api/v1/index"
+        )
+    
+    if not os.getenv("OPENROUTER_API_KEY"):
+        raise HTTPException(
+            status_code=503,
+            detail="OpenRouter API key not configured. Please set OPENROUTER_API_KEY environment variable."
+        )
+    
+    if not request.use_agentic:
+        raise HTTPException(
+            status_code=400,
+            detail="Streaming is only available for the agentic workflow. Use POST /api/v1/legal-query for simple RAG."
+        )
+    
+    if not legal_workflow:
+        raise HTTPException(status_code=500, detail="System not initialized")
+    
+    async def event_generator():
+        async for event in legal_workflow.stream_query(request.query):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/v1/suggestions", response_model=SuggestionResponse)
 async def get_suggestions(query: str):
-    suggestions = [
-        "Compare the reasoning in Kesavananda Bharati and Minerva Mills on the Basic Structure Doctrine",
-        "Explain how the Supreme Court interpreted Article 21 in Puttaswamy",
-        "List cases where sedition laws under IPC Section 124A were challenged",
-        "Summarize how freedom of speech evolved under Article 19(1)(a)",
-        "Identify the ratio decidendi in Maneka Gandhi vs Union of India"
-    ]
-    
     if query and len(query) > 3:
-        filtered = [s for s in suggestions if query.lower() in s.lower()]
+        query_lower = query.lower()
+        filtered = [
+            suggestion
+            for suggestion, suggestion_lower in zip(SUGGESTIONS, SUGGESTIONS_LOWER)
+            if query_lower in suggestion_lower
+        ]
         if filtered:
             return SuggestionResponse(suggestions=filtered[:3])
     
-    return SuggestionResponse(suggestions=suggestions[:3])
+    return SuggestionResponse(suggestions=SUGGESTIONS[:3])
 
 
 @app.get("/api/v1/case/{case_id}")
@@ -1,84 +1,104 @@
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import logging
 from pathlib import Path
 from typing import List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+CASE_COLUMNS = ['title', 'citation', 'decision_date', 'judge', 'court', 'year', 'text']
+
+CASE_DEFAULTS = {
+    'title': 'Untitled Case',
+    'citation': 'No Citation',
+    'decision_date': 'Unknown',
+    'judge': 'Unknown',
+    'court': 'Unknown',
+    'year': 'Unknown'
+}
+
 
 class DataLoader:
     def __init__(self, data_path: str = "data/merged_cases.parquet"):
         self.data_path = Path(data_path)
-        self.df = None
-        
-    def load_data(self) -> pd.DataFrame:
+        self.table = None
+    
+    def load_data(self) -> pa.Table:
         try:
             logger.info(f"Loading data from {self.data_path}")
-            self.df = pd.read_parquet(self.data_path)
-            logger.info(f"Loaded {len(self.df)} cases")
-            return self.df
+            schema = pq.read_schema(self.data_path)
+            columns = [col for col in CASE_COLUMNS if col in schema.names]
+            
+            # Case ids are the pandas index the file was written with, or row numbers without one
+            index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+            index = index_columns[0] if len(index_columns) == 1 else None
+            stored_index = isinstance(index, str) and index in schema.names
+            if stored_index:
+                columns.append(index)
+            
+            table = pq.read_table(self.data_path, columns=columns, memory_map=True)
+            
+            if stored_index:
+                ids = table[index]
+                table = table.drop_columns([index])
+            elif isinstance(index, dict) and index.get('kind') == 'range':
+                ids = pa.array(index['start'] + index['step'] * np.arange(table.num_rows, dtype=np.int64))
+            else:
+                ids = pa.array(np.arange(table.num_rows, dtype=np.int64))
+            
+            self.table = table.append_column('id', ids)
+            logger.info(f"Loaded {self.table.num_rows} cases")
+            return self.table
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
     
-    def preprocess_data(self) -> pd.DataFrame:
-        if self.df is None:
+    def preprocess_data(self) -> pa.Table:
+        if self.table is None:
             self.load_data()
         
         logger.info("Preprocessing data...")
         
-        self.df = self.df.dropna(subset=['text'])
+        keep = pc.is_valid(self.table['text'])
+        table = self.table.filter(keep)
         
-        required_columns = ['title', 'citation', 'decision_date', 'judge', 'court', 'year', 'text']
-        for col in required_columns:
-            if col not in self.df.columns:
-                self.df[col] = None
+        if 'id' in table.column_names:
+            columns = {'id': table['id']}
+        else:
+            columns = {'id': pc.indices_nonzero(keep).cast(pa.int64())}
+        for col in CASE_COLUMNS:
+            if col in table.column_names:
+                column = table[col]
+            else:
+                column = pa.nulls(table.num_rows, pa.string())
+            
+            default = CASE_DEFAULTS.get(col)
+            if default is not None:
+                if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+                    column = column.cast(pa.string())
+                column = column.fill_null(default)
+            
+            columns[col] = column
         
-        self.df = self.df.fillna({
-            'title': 'Untitled Case',
-            'citation': 'No Citation',
-            'decision_date': 'Unknown',
-            'judge': 'Unknown',
-            'court': 'Unknown',
-            'year': 'Unknown'
-        })
+        self.table = pa.table(columns)
         
-        logger.info(f"Preprocessed {len(self.df)} cases")
-        return self.df
+        logger.info(f"Preprocessed {self.table.num_rows} cases")
+        return self.table
     
     def get_case_by_id(self, case_id: int) -> Dict[str, Any]:
-        if self.df is None:
+        if self.table is None:
             self.preprocess_data()
         
-        if case_id < 0 or case_id >= len(self.df):
+        if case_id < 0 or case_id >= self.table.num_rows:
             raise ValueError(f"Invalid case ID: {case_id}")
         
-        case = self.df.iloc[case_id]
-        return {
-            'id': case_id,
-            'title': case['title'],
-            'citation': case['citation'],
-            'decision_date': case['decision_date'],
-            'judge': case['judge'],
-            'court': case['court'],
-            'year': case['year'],
-            'text': case['text']
-        }
+        row = self.table.slice(case_id, 1).to_pylist()[0]
+        return {**row, 'id': case_id}
     
     def get_all_cases(self) -> List[Dict[str, Any]]:
-        if self.df is None:
+        if self.table is None:
             self.preprocess_data()
         
-        cases = []
-        for idx, row in self.df.iterrows():
-            cases.append({
-                'id': idx,
-                'title': row['title'],
-                'citation': row['citation'],
-                'decision_date': row['decision_date'],
-                'judge': row['judge'],
-                'court': row['court'],
-                'year': row['year'],
-                'text': row['text']
-            })
-        return cases
+        return self.table.to_pylist()
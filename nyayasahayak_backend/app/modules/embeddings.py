@@ -1,4 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List
+import numpy as np
 from sentence_transformers import SentenceTransformer
 import logging
 
@@ -9,6 +13,7 @@ class EmbeddingModel:
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         self.model_name = model_name
         self.model = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
         
     def load_model(self):
         if self.model is None:
@@ -16,14 +21,26 @@ class EmbeddingModel:
             self.model = SentenceTransformer(self.model_name)
             logger.info("Embedding model loaded successfully")
     
-    def embed_text(self, text: str) -> List[float]:
+    @property
+    def tokenizer(self):
+        if self.model is None:
+            self.load_model()
+        return self.model.tokenizer
+    
+    @property
+    def max_chunk_tokens(self) -> int:
+        if self.model is None:
+            self.load_model()
+        return self.model.max_seq_length - self.model.tokenizer.num_special_tokens_to_add()
+    
+    def embed_text(self, text: str) -> np.ndarray:
         if self.model is None:
             self.load_model()
         
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        embedding = self.model.encode(text, normalize_embeddings=True)
+        return embedding.astype(np.float32, copy=False)
     
-    def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
         if self.model is None:
             self.load_model()
         
@@ -32,6 +49,17 @@ class EmbeddingModel:
             texts, 
             batch_size=batch_size,
             show_progress_bar=True,
-            convert_to_numpy=True
+            normalize_embeddings=True
+        )
+        return embeddings.astype(np.float32, copy=False)
+    
+    async def aembed_text(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embed_text, text)
+    
+    async def aembed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(self.embed_texts, texts, batch_size=batch_size)
         )
-        return embeddings.tolist()
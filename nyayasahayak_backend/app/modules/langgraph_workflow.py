@@ -1,55 +1,69 @@
-import os
-from typing import Dict, Any, List, TypedDict
-from langgraph.graph import StateGraph, END
+import asyncio
+import operator
+from typing import Dict, Any, List, Annotated, AsyncIterator, TypedDict
+from langgraph.graph import StateGraph, START, END
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from .retriever import VectorRetriever
 
 logger = logging.getLogger(__name__)
 
+QUERY_ANALYSIS_PROMPT = """You are a legal query analyzer. Extract the main legal issues from the user's query.
+Return your response in this format:
+LEGAL ISSUES:
+- [issue 1]
+- [issue 2]"""
+
+SUMMARIZER_PROMPT = """You are a legal case summarizer. Extract the key legal arguments, 
+holdings, and reasoning from the provided case text. Be concise but comprehensive."""
+
+LEGAL_ANALYST_PROMPT = """You are NyayaSahayak, an expert Indian legal AI assistant. 
+Provide comprehensive legal analysis based on the retrieved cases.
+
+Your response should:
+1. Address the legal query directly
+2. Reference specific cases and their holdings
+3. Explain relevant legal principles and doctrines
+4. Provide balanced analysis
+5. Use proper legal terminology
+6. Acknowledge any limitations
+
+Format your response clearly with proper structure."""
+
 
 class AgentState(TypedDict):
     query: str
     legal_issues: List[str]
-    keywords: List[str]
     retrieved_cases: List[Dict[str, Any]]
     case_summaries: List[str]
     legal_analysis: str
     final_answer: str
     related_cases: List[Dict[str, Any]]
-    reasoning_steps: List[str]
+    reasoning_steps: Annotated[List[str], operator.add]
 
 
 class LegalAgentWorkflow:
     def __init__(
         self,
         retriever: VectorRetriever,
-        api_key: str = None,
-        base_url: str = "https://openrouter.ai/api/v1",
+        client: AsyncOpenAI = None,
         model: str = "openai/gpt-4o-mini"
     ):
         self.retriever = retriever
-        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
-        self.base_url = base_url
+        self.client = client
         self.model = model
         
-        if self.api_key:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url
-            )
-        else:
-            self.client = None
-            logger.warning("No OpenRouter API key provided")
+        if self.client is None:
+            logger.warning("No OpenRouter client provided")
         
         self.workflow = self._build_workflow()
     
-    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> str:
+    async def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> str:
         if not self.client:
             return "API key not configured"
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -63,118 +77,124 @@ class LegalAgentWorkflow:
             logger.error(f"LLM call error: {e}")
             return f"Error: {str(e)}"
     
-    def query_analysis_node(self, state: AgentState) -> AgentState:
+    async def _stream_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> AsyncIterator[str]:
+        if not self.client:
+            yield "API key not configured"
+            return
+        
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def query_analysis_node(self, state: AgentState) -> Dict[str, Any]:
         logger.info("Node: Query Analysis")
         
         query = state['query']
-        state['reasoning_steps'].append("Analyzing query for legal issues and keywords")
-        
-        system_prompt = """You are a legal query analyzer. Extract the main legal issues and keywords from the user's query.
-Return your response in this format:
-LEGAL ISSUES:
-- [issue 1]
-- [issue 2]
-
-KEYWORDS:
-- [keyword 1]
-- [keyword 2]"""
         
         user_prompt = f"Analyze this legal query: {query}"
         
-        response = self._call_llm(system_prompt, user_prompt, max_tokens=500)
+        response = await self._call_llm(QUERY_ANALYSIS_PROMPT, user_prompt, max_tokens=500)
         
         legal_issues = []
-        keywords = []
         
-        lines = response.split('\n')
-        current_section = None
-        
-        for line in lines:
+        for line in response.split('\n'):
             line = line.strip()
-            if 'LEGAL ISSUES:' in line:
-                current_section = 'issues'
-            elif 'KEYWORDS:' in line:
-                current_section = 'keywords'
-            elif line.startswith('-'):
-                item = line[1:].strip()
-                if current_section == 'issues':
-                    legal_issues.append(item)
-                elif current_section == 'keywords':
-                    keywords.append(item)
-        
-        state['legal_issues'] = legal_issues if legal_issues else [query]
-        state['keywords'] = keywords if keywords else [query]
-        
-        return state
+            if line.startswith('-'):
+                legal_issues.append(line[1:].strip())
+        
+        return {
+            'legal_issues': legal_issues if legal_issues else [query],
+            'reasoning_steps': ["Analyzing query for legal issues"]
+        }
     
-    def retrieval_node(self, state: AgentState) -> AgentState:
+    async def retrieval_node(self, state: AgentState) -> Dict[str, Any]:
         logger.info("Node: Retrieval")
         
-        state['reasoning_steps'].append("Retrieving relevant legal cases from database")
+        retrieved_docs = await self.retriever.aretrieve(state['query'], top_k=7)
         
-        query = state['query']
-        keywords_str = " ".join(state['keywords'])
-        search_query = f"{query} {keywords_str}"
-        
-        retrieved_docs = self.retriever.retrieve(search_query, top_k=7)
+        case_metadata = {}
+        for doc in retrieved_docs:
+            case_metadata.setdefault(doc['metadata'].get('case_id'), doc['metadata'])
+        
+        related_cases = [
+            {
+                'title': metadata.get('title'),
+                'citation': metadata.get('citation'),
+                'court': metadata.get('court'),
+                'decision_date': metadata.get('decision_date')
+            }
+            for metadata in case_metadata.values()
+        ]
         
-        state['retrieved_cases'] = retrieved_docs
+        return {
+            'retrieved_cases': retrieved_docs,
+            'related_cases': related_cases,
+            'reasoning_steps': ["Retrieving relevant legal cases from database"]
+        }
+    
+    async def summarizer_node(self, state: AgentState) -> Dict[str, Any]:
+        logger.info("Node: Summarizer")
         
-        related_cases = []
+        cases = []
         seen_cases = set()
         
-        for doc in retrieved_docs:
+        for doc in state['retrieved_cases']:
             case_id = doc['metadata'].get('case_id')
             if case_id not in seen_cases:
                 seen_cases.add(case_id)
-                related_cases.append({
-                    'title': doc['metadata'].get('title'),
-                    'citation': doc['metadata'].get('citation'),
-                    'court': doc['metadata'].get('court'),
-                    'decision_date': doc['metadata'].get('decision_date')
-                })
+                cases.append(doc)
+                if len(cases) == 5:
+                    break
         
-        state['related_cases'] = related_cases
-        
-        return state
-    
-    def summarizer_node(self, state: AgentState) -> AgentState:
-        logger.info("Node: Summarizer")
-        
-        state['reasoning_steps'].append("Summarizing key arguments from retrieved cases")
-        
-        retrieved_cases = state['retrieved_cases']
-        
-        summaries = []
-        
-        for i, doc in enumerate(retrieved_cases[:5], 1):
-            metadata = doc['metadata']
-            text = doc['text']
-            
-            system_prompt = """You are a legal case summarizer. Extract the key legal arguments, 
-holdings, and reasoning from the provided case text. Be concise but comprehensive."""
-            
-            user_prompt = f"""Case: {metadata.get('title')}
-Citation: {metadata.get('citation')}
+        user_prompts = [
+            f"""Case: {doc['metadata'].get('title')}
+Citation: {doc['metadata'].get('citation')}
 
 Text:
-{text[:2000]}
+{doc['text'][:2000]}
 
 Provide a brief summary of the key legal points."""
-            
-            summary = self._call_llm(system_prompt, user_prompt, max_tokens=300)
-            
-            summaries.append(f"[{metadata.get('title')}]: {summary}")
+            for doc in cases
+        ]
         
-        state['case_summaries'] = summaries
+        results = await asyncio.gather(*[
+            self._call_llm(SUMMARIZER_PROMPT, user_prompt, max_tokens=300)
+            for user_prompt in user_prompts
+        ])
         
-        return state
+        return {
+            'case_summaries': [
+                f"[{doc['metadata'].get('title')}]: {summary}"
+                for doc, summary in zip(cases, results)
+            ],
+            'reasoning_steps': ["Summarizing key arguments from retrieved cases"]
+        }
     
-    def legal_analyst_node(self, state: AgentState) -> AgentState:
+    async def legal_analyst_node(self, state: AgentState) -> Dict[str, Any]:
         logger.info("Node: Legal Analyst")
         
-        state['reasoning_steps'].append("Synthesizing legal analysis and generating final answer")
+        user_prompt = self._build_analysis_prompt(state)
         
+        analysis = await self._call_llm(LEGAL_ANALYST_PROMPT, user_prompt, max_tokens=2000)
+        
+        return {
+            'legal_analysis': analysis,
+            'final_answer': analysis,
+            'reasoning_steps': ["Synthesizing legal analysis and generating final answer"]
+        }
+    
+    def _build_analysis_prompt(self, state: AgentState) -> str:
         query = state['query']
         legal_issues = state['legal_issues']
         case_summaries = state['case_summaries']
@@ -187,20 +207,7 @@ Provide a brief summary of the key legal points."""
             for case in related_cases[:5]
         ])
         
-        system_prompt = """You are NyayaSahayak, an expert Indian legal AI assistant. 
-Provide comprehensive legal analysis based on the retrieved cases.
-
-Your response should:
-1. Address the legal query directly
-2. Reference specific cases and their holdings
-3. Explain relevant legal principles and doctrines
-4. Provide balanced analysis
-5. Use proper legal terminology
-6. Acknowledge any limitations
-
-Format your response clearly with proper structure."""
-        
-        user_prompt = f"""Query: {query}
+        return f"""Query: {query}
 
 Legal Issues Identified:
 {chr(10).join(f"- {issue}" for issue in legal_issues)}
@@ -212,13 +219,6 @@ Case Summaries and Analysis:
 {context}
 
 Provide a comprehensive legal analysis addressing the query."""
-        
-        analysis = self._call_llm(system_prompt, user_prompt, max_tokens=2000)
-        
-        state['legal_analysis'] = analysis
-        state['final_answer'] = analysis
-        
-        return state
     
     def _build_workflow(self) -> StateGraph:
         workflow = StateGraph(AgentState)
@@ -228,22 +228,19 @@ Provide a comprehensive legal analysis addressing the query."""
         workflow.add_node("summarizer", self.summarizer_node)
         workflow.add_node("legal_analyst", self.legal_analyst_node)
         
-        workflow.set_entry_point("query_analysis")
+        workflow.add_edge(START, "query_analysis")
+        workflow.add_edge(START, "retrieval")
         
-        workflow.add_edge("query_analysis", "retrieval")
-        workflow.add_edge("retrieval", "summarizer")
+        workflow.add_edge(["query_analysis", "retrieval"], "summarizer")
         workflow.add_edge("summarizer", "legal_analyst")
         workflow.add_edge("legal_analyst", END)
         
         return workflow.compile()
     
-    def process_query(self, query: str) -> Dict[str, Any]:
-        logger.info(f"Processing query with LangGraph: {query}")
-        
-        initial_state: AgentState = {
+    def _initial_state(self, query: str) -> AgentState:
+        return {
             'query': query,
             'legal_issues': [],
-            'keywords': [],
             'retrieved_cases': [],
             'case_summaries': [],
             'legal_analysis': '',
@@ -251,9 +248,21 @@ Provide a comprehensive legal analysis addressing the query."""
             'related_cases': [],
             'reasoning_steps': []
         }
+    
+    def _apply_update(self, state: AgentState, update: Dict[str, Any]):
+        for key, value in update.items():
+            if key == 'reasoning_steps':
+                state[key] = state[key] + value
+            else:
+                state[key] = value
+    
+    async def process_query(self, query: str) -> Dict[str, Any]:
+        logger.info(f"Processing query with LangGraph: {query}")
+        
+        initial_state = self._initial_state(query)
         
         try:
-            final_state = self.workflow.invoke(initial_state)
+            final_state = await self.workflow.ainvoke(initial_state)
             
             return {
                 'query': query,
@@ -277,3 +286,40 @@ Provide a comprehensive legal analysis addressing the query."""
                 'reasoning_steps': [],
                 'processing_info': {}
             }
+    
+    async def stream_query(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        logger.info(f"Streaming query with LangGraph nodes: {query}")
+        
+        state = self._initial_state(query)
+        
+        try:
+            analysis_update, retrieval_update = await asyncio.gather(
+                self.query_analysis_node(state),
+                self.retrieval_node(state)
+            )
+            self._apply_update(state, analysis_update)
+            self._apply_update(state, retrieval_update)
+            self._apply_update(state, await self.summarizer_node(state))
+            
+            logger.info("Node: Legal Analyst (streaming)")
+            state['reasoning_steps'].append("Synthesizing legal analysis and generating final answer")
+            
+            user_prompt = self._build_analysis_prompt(state)
+            
+            async for token in self._stream_llm(LEGAL_ANALYST_PROMPT, user_prompt, max_tokens=2000):
+                yield {'token': token}
+            
+            yield {
+                'done': True,
+                'related_cases': state['related_cases'],
+                'legal_issues': state['legal_issues'],
+                'reasoning_steps': state['reasoning_steps'],
+                'processing_info': {
+                    'cases_retrieved': len(state['retrieved_cases']),
+                    'cases_analyzed': len(state['case_summaries'])
+                }
+            }
+        
+        except Exception as e:
+            logger.error(f"Streaming workflow error: {e}")
+            yield {'error': f"Error processing query: {str(e)}"}
@@ -1,7 +1,7 @@
-import os
+import io
 from typing import List, Dict, Any
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from .retriever import VectorRetriever
 
 logger = logging.getLogger(__name__)
@@ -11,37 +11,31 @@ class RAGAgent:
     def __init__(
         self, 
         retriever: VectorRetriever,
-        api_key: str = None,
-        base_url: str = "https://openrouter.ai/api/v1",
+        client: AsyncOpenAI = None,
         model: str = "openai/gpt-4o-mini"
     ):
         self.retriever = retriever
-        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
-        self.base_url = base_url
+        self.client = client
         self.model = model
         
-        if self.api_key:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url
-            )
-        else:
-            self.client = None
-            logger.warning("No OpenRouter API key provided. LLM functionality will be limited.")
+        if self.client is None:
+            logger.warning("No OpenRouter client provided. LLM functionality will be limited.")
     
-    def retrieve_context(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    async def retrieve_context(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         logger.info(f"Retrieving context for query: {query}")
-        results = self.retriever.retrieve(query, top_k=top_k)
+        results = await self.retriever.aretrieve(query, top_k=top_k)
         return results
     
     def format_context(self, retrieved_docs: List[Dict[str, Any]]) -> str:
-        context_parts = []
+        buffer = io.StringIO()
         
         for i, doc in enumerate(retrieved_docs, 1):
             metadata = doc['metadata']
             text = doc['text']
             
-            context_part = f"""
+            if i > 1:
+                buffer.write("\n")
+            buffer.write(f"""
 [Case {i}]
 Title: {metadata.get('title', 'N/A')}
 Citation: {metadata.get('citation', 'N/A')}
@@ -53,12 +47,11 @@ Relevant Text:
 {text}
 
 ---
-"""
-            context_parts.append(context_part)
+""")
         
-        return "\n".join(context_parts)
+        return buffer.getvalue()
     
-    def generate_response(
+    async def generate_response(
         self, 
         query: str, 
         context: str,
@@ -91,7 +84,7 @@ QUERY: {query}
 Please provide a comprehensive legal analysis."""
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -107,16 +100,17 @@ Please provide a comprehensive legal analysis."""
             logger.error(f"Error generating response: {e}")
             return f"Error generating response: {str(e)}"
     
-    def process_query(
+    async def process_query(
         self, 
         query: str, 
-        top_k: int = 5
+        top_k: int = 5,
+        debug: bool = False
     ) -> Dict[str, Any]:
-        retrieved_docs = self.retrieve_context(query, top_k=top_k)
+        retrieved_docs = await self.retrieve_context(query, top_k=top_k)
         
         context = self.format_context(retrieved_docs)
         
-        answer = self.generate_response(query, context)
+        answer = await self.generate_response(query, context)
         
         related_cases = []
         seen_cases = set()
@@ -132,9 +126,13 @@ Please provide a comprehensive legal analysis."""
                     'decision_date': doc['metadata'].get('decision_date')
                 })
         
-        return {
+        result = {
             'query': query,
             'answer': answer,
-            'related_cases': related_cases,
-            'context': context
+            'related_cases': related_cases
         }
+        
+        if debug:
+            result['context'] = context
+        
+        return result
@@ -1,20 +1,37 @@
+import asyncio
+import os
+import threading
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from typing import List, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from pathlib import Path
 from .embeddings import EmbeddingModel
-from .utils import chunk_text
+from .utils import chunk_texts, strip_boilerplate
 
 logger = logging.getLogger(__name__)
 
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+    "hnsw:num_threads": os.cpu_count() or 1
+}
+
 
 class VectorRetriever:
     def __init__(
         self, 
         persist_directory: str = "vectorstore",
         collection_name: str = "legal_cases",
-        embedding_model: EmbeddingModel = None
+        embedding_model: EmbeddingModel = None,
+        cache_size: int = 1024,
+        semantic_cache_size: int = 256,
+        semantic_threshold: float = 0.95
     ):
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(exist_ok=True)
@@ -28,19 +45,94 @@ class VectorRetriever:
         )
         
         self.collection = None
+        
+        self.cache_size = cache_size
+        self.semantic_cache_size = semantic_cache_size
+        self.semantic_threshold = semantic_threshold
+        
+        self._cache_lock = threading.Lock()
+        self._exact_cache: OrderedDict[Tuple[str, int], List[Dict[str, Any]]] = OrderedDict()
+        self._sem_cache_embs: Optional[np.ndarray] = None
+        self._sem_cache_top_k = np.zeros(semantic_cache_size, dtype=np.int64)
+        self._sem_scores = np.empty(semantic_cache_size, dtype=np.float32)
+        self._sem_cache_docs: List[List[Dict[str, Any]]] = []
+        self._sem_cache_pos = 0
+    
+    def clear_cache(self):
+        with self._cache_lock:
+            self._exact_cache.clear()
+            self._sem_cache_embs = None
+            self._sem_cache_docs = []
+            self._sem_cache_pos = 0
+    
+    def _cache_exact(self, key: Tuple[str, int], docs: List[Dict[str, Any]]):
+        with self._cache_lock:
+            self._exact_cache[key] = docs
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > self.cache_size:
+                self._exact_cache.popitem(last=False)
+    
+    def _semantic_lookup(self, query_unit: np.ndarray, top_k: int) -> Optional[List[Dict[str, Any]]]:
+        with self._cache_lock:
+            n = len(self._sem_cache_docs)
+            if n == 0:
+                return None
+            
+            scores = self._sem_scores[:n]
+            np.matmul(self._sem_cache_embs[:n], query_unit, out=scores)
+            np.putmask(scores, self._sem_cache_top_k[:n] != top_k, -1.0)
+            
+            best = int(np.argmax(scores))
+            if scores[best] >= self.semantic_threshold:
+                return self._sem_cache_docs[best]
+            return None
+    
+    def _cache_semantic(self, query_unit: np.ndarray, top_k: int, docs: List[Dict[str, Any]]):
+        if self.semantic_cache_size <= 0:
+            return
+        
+        with self._cache_lock:
+            if self._sem_cache_embs is None:
+                self._sem_cache_embs = np.zeros(
+                    (self.semantic_cache_size, query_unit.shape[0]),
+                    dtype=np.float32
+                )
+            
+            slot = self._sem_cache_pos
+            self._sem_cache_embs[slot] = query_unit
+            self._sem_cache_top_k[slot] = top_k
+            if slot < len(self._sem_cache_docs):
+                self._sem_cache_docs[slot] = docs
+            else:
+                self._sem_cache_docs.append(docs)
+            self._sem_cache_pos = (slot + 1) % self.semantic_cache_size
     
     def create_collection(self):
         try:
             self.collection = self.client.get_collection(name=self.collection_name)
             logger.info(f"Loaded existing collection: {self.collection_name}")
+            
+            space = (self.collection.metadata or {}).get("hnsw:space")
+            if space != HNSW_METADATA["hnsw:space"]:
+                logger.warning(
+                    f"Collection {self.collection_name} uses '{space or 'l2'}' distance with default HNSW "
+                    "settings. Delete the vectorstore directory and reindex to apply the tuned index."
+                )
         except Exception:
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"description": "Legal cases vector database"}
+                metadata={"description": "Legal cases vector database", **HNSW_METADATA}
             )
             logger.info(f"Created new collection: {self.collection_name}")
     
-    def index_cases(self, cases: List[Dict[str, Any]], chunk_size: int = 1024):
+    def index_cases(
+        self,
+        cases: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: int = 32,
+        batch_size: int = 512,
+        min_chunk_chars: int = 200
+    ):
         if self.collection is None:
             self.create_collection()
         
@@ -50,46 +142,73 @@ class VectorRetriever:
         metadatas = []
         ids = []
         
-        for case in cases:
-            case_id = case['id']
-            text = case['text']
-            
-            chunks = chunk_text(text, chunk_size=chunk_size)
+        tokenizer = self.embedding_model.tokenizer
+        if chunk_size is None:
+            chunk_size = self.embedding_model.max_chunk_tokens
+        
+        for start in range(0, len(cases), batch_size):
+            case_batch = cases[start:start+batch_size]
+            batch_chunks = chunk_texts(
+                [strip_boilerplate(case['text']) for case in case_batch],
+                tokenizer,
+                chunk_size=chunk_size,
+                overlap=chunk_overlap
+            )
             
-            for chunk_idx, chunk in enumerate(chunks):
-                doc_id = f"case_{case_id}_chunk_{chunk_idx}"
-                
-                documents.append(chunk)
-                metadatas.append({
+            for case, chunks in zip(case_batch, batch_chunks):
+                case_id = case['id']
+                base_metadata = {
                     'case_id': str(case_id),
                     'title': case['title'],
                     'citation': case['citation'],
                     'court': case['court'],
                     'judge': case['judge'],
                     'decision_date': case['decision_date'],
-                    'year': case['year'],
-                    'chunk_index': str(chunk_idx)
-                })
-                ids.append(doc_id)
+                    'year': case['year']
+                }
+                
+                for chunk_idx, chunk in enumerate(chunks):
+                    chunk = chunk.strip()
+                    if len(chunk) < min_chunk_chars and len(chunks) > 1:
+                        continue
+                    
+                    doc_id = f"case_{case_id}_chunk_{chunk_idx}"
+                    
+                    documents.append(chunk)
+                    metadatas.append({**base_metadata, 'chunk_index': str(chunk_idx)})
+                    ids.append(doc_id)
         
         logger.info(f"Created {len(documents)} chunks from {len(cases)} cases")
         
-        batch_size = 100
-        for i in range(0, len(documents), batch_size):
-            batch_docs = documents[i:i+batch_size]
-            batch_metas = metadatas[i:i+batch_size]
-            batch_ids = ids[i:i+batch_size]
-            
-            embeddings = self.embedding_model.embed_texts(batch_docs)
-            
-            self.collection.add(
-                documents=batch_docs,
-                embeddings=embeddings,
-                metadatas=batch_metas,
-                ids=batch_ids
-            )
+        starts = range(0, len(documents), batch_size)
+        total_batches = len(starts)
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-embed") as pool:
+            next_embeddings = None
+            if total_batches:
+                next_embeddings = pool.submit(self.embedding_model.embed_texts, documents[:batch_size])
             
-            logger.info(f"Indexed batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}")
+            for batch_num, i in enumerate(starts, 1):
+                batch_docs = documents[i:i+batch_size]
+                batch_metas = metadatas[i:i+batch_size]
+                batch_ids = ids[i:i+batch_size]
+                
+                embeddings = next_embeddings.result()
+                
+                if batch_num < total_batches:
+                    next_docs = documents[i+batch_size:i+2*batch_size]
+                    next_embeddings = pool.submit(self.embedding_model.embed_texts, next_docs)
+                
+                self.collection.add(
+                    documents=batch_docs,
+                    embeddings=embeddings,
+                    metadatas=batch_metas,
+                    ids=batch_ids
+                )
+                
+                logger.info(f"Indexed batch {batch_num}/{total_batches}")
+        
+        self.clear_cache()
         
         logger.info("Indexing complete!")
     
@@ -101,10 +220,53 @@ class VectorRetriever:
         if self.collection is None:
             self.create_collection()
         
+        cache_key = (query.strip().lower(), top_k)
+        cached = self._get_exact(cache_key)
+        if cached is not None:
+            return cached
+        
         query_embedding = self.embedding_model.embed_text(query)
         
+        return self._retrieve_by_embedding(cache_key, query_embedding, top_k)
+    
+    async def aretrieve(
+        self, 
+        query: str, 
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        if self.collection is None:
+            self.create_collection()
+        
+        cache_key = (query.strip().lower(), top_k)
+        cached = self._get_exact(cache_key)
+        if cached is not None:
+            return cached
+        
+        query_embedding = await self.embedding_model.aembed_text(query)
+        
+        return await asyncio.to_thread(self._retrieve_by_embedding, cache_key, query_embedding, top_k)
+    
+    def _get_exact(self, cache_key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+        with self._cache_lock:
+            cached = self._exact_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._exact_cache.move_to_end(cache_key)
+        return list(cached)
+    
+    def _retrieve_by_embedding(
+        self,
+        cache_key: Tuple[str, int],
+        query_embedding: np.ndarray,
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        cached = self._semantic_lookup(query_embedding, top_k)
+        if cached is not None:
+            self._cache_exact(cache_key, cached)
+            return list(cached)
+        
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embedding[None, :],
             n_results=top_k
         )
         
@@ -119,7 +281,10 @@ class VectorRetriever:
                 }
                 retrieved_docs.append(doc)
         
-        return retrieved_docs
+        self._cache_exact(cache_key, retrieved_docs)
+        self._cache_semantic(query_embedding, top_k, retrieved_docs)
+        
+        return list(retrieved_docs)
     
     def get_collection_count(self) -> int:
         if self.collection is None:
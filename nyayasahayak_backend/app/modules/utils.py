@@ -1,77 +1,243 @@
 import re
-from typing import List, Dict, Any
+from itertools import islice
+from typing import List, Dict, Any, Tuple, Union
 import logging
+import threading
+import numpy as np
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+_SENT_BREAK_RE = re.compile(r'[.!?](\s+)')
+_WORD_RE = re.compile(r'\S+')
+_BOILERPLATE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"IN THE SUPREME COURT OF INDIA"
+    r"|(?-i:IN THE HIGH COURT OF [A-Z][A-Z &(),-]{0,80})"
+    r"|(?:NON-)?REPORTABLE"
+    r"|Page \d+(?: of \d+)?"
+    r"|- ?\d+ ?-"
+    r"|\d+ ?\| ?Page"
+    r"|Indian Kanoon - http://indiankanoon\.org/doc/\d+/?"
+    r"|Signature Not Verified"
+    r"|(?-i:Digitally signed by [^\n.,;:!?]{1,60}(?:Date: [\d.: ]+(?:IST)?)?)"
+    r")[ \t]*(?:\r?\n|\Z)",
+    re.IGNORECASE | re.MULTILINE
+)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+LEGAL_TERMS = (
+    'article', 'section', 'act', 'constitution', 'supreme court', 
+    'high court', 'judgment', 'petition', 'appellant', 'respondent',
+    'ratio decidendi', 'obiter dicta', 'precedent', 'doctrine',
+    'fundamental rights', 'directive principles', 'writ', 'habeas corpus',
+    'mandamus', 'certiorari', 'prohibition', 'quo warranto'
+)
+
+if hyperscan is not None:
+    _LEGAL_TERMS_DB = hyperscan.Database()
+    _LEGAL_TERMS_DB.compile(
+        expressions=[re.escape(term).encode() for term in LEGAL_TERMS],
+        ids=list(range(len(LEGAL_TERMS))),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(LEGAL_TERMS)
+    )
+else:
+    _LEGAL_TERMS_DB = None
+
+# Hyperscan scratch space cannot be shared by concurrent scans
+_hs_local = threading.local()
+
+if ahocorasick is not None:
+    _LEGAL_TERMS_AUTOMATON = ahocorasick.Automaton()
+    for _term in LEGAL_TERMS:
+        _LEGAL_TERMS_AUTOMATON.add_word(_term, _term)
+    _LEGAL_TERMS_AUTOMATON.make_automaton()
+else:
+    _LEGAL_TERMS_AUTOMATON = None
+
+# Zero-width lookahead so overlapping occurrences are reported, matching substring semantics
+_LEGAL_TERMS_RE = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(LEGAL_TERMS, key=len, reverse=True))) + '))'
+)
+
+_CASE_FIELDS = (
+    ("Title", "title"),
+    ("Citation", "citation"),
+    ("Court", "court"),
+    ("Judge", "judge"),
+    ("Decision Date", "decision_date"),
+    ("Year", "year")
+)
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences = []
+    start = 0
+    
+    for match in _SENT_BREAK_RE.finditer(text):
+        gap_start, gap_end = match.span(1)
+        sentences.append(text[start:gap_start])
+        start = gap_end
+    
+    sentences.append(text[start:])
+    return sentences
+
 
-def chunk_text(text: str, chunk_size: int = 1024, overlap: int = 128) -> List[str]:
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+class DocView:
+    __slots__ = ('text', '_lower', '_sentences')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._lower = None
+        self._sentences = None
+    
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
     
-    chunks = []
-    current_chunk = []
+    @property
+    def sentences(self) -> List[str]:
+        if self._sentences is None:
+            self._sentences = _split_sentences(self.text)
+        return self._sentences
+
+
+def _build_chunks(lengths: List[int], chunk_size: int, overlap: int) -> List[Tuple[int, int]]:
+    bounds = []
+    start = 0
     current_length = 0
     
-    for sentence in sentences:
-        sentence_length = len(sentence.split())
-        
-        if current_length + sentence_length > chunk_size and current_chunk:
-            chunks.append(' '.join(current_chunk))
+    for i, length in enumerate(lengths):
+        if current_length + length > chunk_size and i > start:
+            bounds.append((start, i))
             
-            overlap_words = []
-            overlap_length = 0
-            for s in reversed(current_chunk):
-                s_length = len(s.split())
-                if overlap_length + s_length <= overlap:
-                    overlap_words.insert(0, s)
-                    overlap_length += s_length
-                else:
-                    break
-            
-            current_chunk = overlap_words
-            current_length = overlap_length
+            j = i
+            current_length = 0
+            while j > start and current_length + lengths[j - 1] <= overlap:
+                j -= 1
+                current_length += lengths[j]
+            start = j
         
-        current_chunk.append(sentence)
-        current_length += sentence_length
+        current_length += length
+    
+    if start < len(lengths):
+        bounds.append((start, len(lengths)))
     
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    return bounds
+
+
+def chunk_text(text: Union[str, DocView], chunk_size: int = 1024, overlap: int = 128) -> List[str]:
+    if isinstance(text, DocView):
+        sentences = text.sentences
+    else:
+        sentences = _split_sentences(text)
+    
+    lengths = [len(sentence.split()) for sentence in sentences]
+    return [' '.join(sentences[start:end]) for start, end in _build_chunks(lengths, chunk_size, overlap)]
+
+
+def strip_boilerplate(text: str) -> str:
+    text = _BOILERPLATE_RE.sub("", text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def chunk_texts(
+    texts: List[str],
+    tokenizer,
+    chunk_size: int = 256,
+    overlap: int = 32
+) -> List[List[str]]:
+    if not 0 <= overlap < chunk_size:
+        raise ValueError(f"Invalid chunk overlap {overlap} for chunk size {chunk_size}")
+    
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        verbose=False
+    )
+    
+    stride = chunk_size - overlap
+    all_chunks = []
+    
+    for text, offsets in zip(texts, encoded['offset_mapping']):
+        num_tokens = len(offsets)
+        if num_tokens == 0:
+            all_chunks.append([])
+            continue
+        
+        offsets = np.asarray(offsets)
+        starts = np.arange(0, max(num_tokens - overlap, 1), stride)
+        ends = np.minimum(starts + chunk_size, num_tokens)
+        
+        char_starts = offsets[starts, 0].tolist()
+        char_ends = offsets[ends - 1, 1].tolist()
+        
+        all_chunks.append([text[s:e] for s, e in zip(char_starts, char_ends)])
     
-    return chunks
+    return all_chunks
 
 
-def extract_legal_keywords(text: str) -> List[str]:
-    legal_terms = [
-        'article', 'section', 'act', 'constitution', 'supreme court', 
-        'high court', 'judgment', 'petition', 'appellant', 'respondent',
-        'ratio decidendi', 'obiter dicta', 'precedent', 'doctrine',
-        'fundamental rights', 'directive principles', 'writ', 'habeas corpus',
-        'mandamus', 'certiorari', 'prohibition', 'quo warranto'
-    ]
+def extract_legal_keywords(text: Union[str, DocView]) -> List[str]:
+    text_lower = text.lower if isinstance(text, DocView) else text.lower()
+    
+    if _LEGAL_TERMS_DB is not None:
+        found_ids = set()
+        
+        def on_match(term_id, start, end, flags, context):
+            found_ids.add(term_id)
+            return len(found_ids) == len(LEGAL_TERMS)
+        
+        scratch = getattr(_hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = _hs_local.scratch = hyperscan.Scratch(_LEGAL_TERMS_DB)
+        
+        try:
+            _LEGAL_TERMS_DB.scan(
+                text_lower.encode('utf-8', 'surrogatepass'),
+                match_event_handler=on_match,
+                scratch=scratch
+            )
+        except hyperscan.ScanTerminated:
+            pass
+        return [term for i, term in enumerate(LEGAL_TERMS) if i in found_ids]
     
-    text_lower = text.lower()
-    found_keywords = []
+    if _LEGAL_TERMS_AUTOMATON is not None:
+        matches = (term for _, term in _LEGAL_TERMS_AUTOMATON.iter(text_lower))
+    else:
+        matches = (match.group(1) for match in _LEGAL_TERMS_RE.finditer(text_lower))
     
-    for term in legal_terms:
-        if term in text_lower:
-            found_keywords.append(term)
+    found = set()
+    for term in matches:
+        found.add(term)
+        if len(found) == len(LEGAL_TERMS):
+            break
     
-    return found_keywords
+    return [term for term in LEGAL_TERMS if term in found]
 
 
 def format_case_metadata(case: Dict[str, Any]) -> str:
-    return f"""
-Title: {case.get('title', 'N/A')}
-Citation: {case.get('citation', 'N/A')}
-Court: {case.get('court', 'N/A')}
-Judge: {case.get('judge', 'N/A')}
-Decision Date: {case.get('decision_date', 'N/A')}
-Year: {case.get('year', 'N/A')}
-""".strip()
-
-
-def extract_case_summary(text: str, max_length: int = 500) -> str:
-    words = text.split()
+    return "\n".join(f"{label}: {case.get(key, 'N/A')}" for label, key in _CASE_FIELDS)
+
+
+def extract_case_summary(text: Union[str, DocView], max_length: int = 500) -> str:
+    if isinstance(text, DocView):
+        text = text.text
+    
+    words = list(islice(_WORD_RE.finditer(text), max_length + 1))
     if len(words) <= max_length:
         return text
-    return ' '.join(words[:max_length]) + '...'
+    return ' '.join(match.group(0) for match in words[:max_length]) + '...'
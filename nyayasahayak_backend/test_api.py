@@ -1,45 +1,51 @@
 #!/usr/bin/env python3
 import requests
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:8000"
 
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+
+def _report(title, response):
+    header = f"{title}\nStatus: {response.status_code}\nResponse: "
+    if sys.stdout.isatty():
+        print(f"{header}{json.dumps(response.json(), indent=2)}\n")
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(header.encode() + response.content + b"\n\n")
+        sys.stdout.buffer.flush()
+
 
 def test_health():
-    print("Testing /health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    print()
+    response = SESSION.get(f"{BASE_URL}/health")
+    _report("Testing /health endpoint...", response)
 
 
 def test_status():
-    print("Testing /status endpoint...")
-    response = requests.get(f"{BASE_URL}/status")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    print()
+    response = SESSION.get(f"{BASE_URL}/status")
+    _report("Testing /status endpoint...", response)
     return response.json()
 
 
 def test_suggestions():
-    print("Testing /api/v1/suggestions endpoint...")
-    response = requests.get(f"{BASE_URL}/api/v1/suggestions", params={"query": "article"})
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    print()
+    response = SESSION.get(f"{BASE_URL}/api/v1/suggestions", params={"query": "article"})
+    _report("Testing /api/v1/suggestions endpoint...", response)
 
 
 def test_query_without_indexing():
-    print("Testing /api/v1/legal-query without indexing (should fail)...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/v1/legal-query",
         json={"query": "What is Article 21?", "use_agentic": False}
     )
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    print()
+    _report("Testing /api/v1/legal-query without indexing (should fail)...", response)
 
 
 def main():
@@ -48,11 +54,18 @@ def main():
     print("=" * 80)
     print()
     
-    test_health()
-    
-    status = test_status()
-    
-    test_suggestions()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(test_health): "health",
+            executor.submit(test_status): "status",
+            executor.submit(test_suggestions): "suggestions"
+        }
+        
+        for future in as_completed(futures):
+            if futures[future] == "status":
+                status = future.result()
+            else:
+                future.result()
     
     if not status.get("system_ready"):
         print("⚠️  System is not ready. Indexing is required.")
@@ -0,0 +1,18 @@
+import re
+
+import pytest
+
+
+class WhitespaceTokenizer:
+    def __call__(self, texts, **kwargs):
+        return {
+            'offset_mapping': [
+                [match.span() for match in re.finditer(r'\S+', text)]
+                for text in texts
+            ]
+        }
+
+
+@pytest.fixture
+def tokenizer():
+    return WhitespaceTokenizer()
@@ -0,0 +1,58 @@
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.modules.data_loader import DataLoader
+
+
+def _write(path, table, index_columns=None):
+    if index_columns is not None:
+        metadata = {b'pandas': json.dumps({'index_columns': index_columns}).encode()}
+        table = table.replace_schema_metadata(metadata)
+    pq.write_table(table, path)
+    return path
+
+
+def test_ids_are_row_numbers_without_pandas_index(tmp_path):
+    path = _write(tmp_path / "cases.parquet", pa.table({'text': ['a', None, 'b']}))
+
+    cases = DataLoader(str(path)).get_all_cases()
+
+    assert [case['id'] for case in cases] == [0, 2]
+
+
+def test_ids_come_from_stored_pandas_index(tmp_path):
+    table = pa.table({
+        'title': ['a', None, 'c'],
+        'text': ['x', 'y', None],
+        '__index_level_0__': [10, 20, 30]
+    })
+    path = _write(tmp_path / "cases.parquet", table, ['__index_level_0__'])
+
+    loader = DataLoader(str(path))
+    cases = loader.get_all_cases()
+
+    assert [case['id'] for case in cases] == [10, 20]
+    assert cases[1]['title'] == 'Untitled Case'
+    assert '__index_level_0__' not in loader.table.column_names
+
+
+def test_ids_come_from_range_index(tmp_path):
+    index = {'kind': 'range', 'name': None, 'start': 5, 'stop': 11, 'step': 2}
+    path = _write(tmp_path / "cases.parquet", pa.table({'text': ['x', None, 'z']}), [index])
+
+    cases = DataLoader(str(path)).get_all_cases()
+
+    assert [case['id'] for case in cases] == [5, 9]
+
+
+def test_preprocess_is_idempotent(tmp_path):
+    path = _write(tmp_path / "cases.parquet", pa.table({'text': [None, 'a', None, 'b']}))
+
+    loader = DataLoader(str(path))
+    first = loader.preprocess_data().to_pylist()
+    second = loader.preprocess_data().to_pylist()
+
+    assert first == second
+    assert [case['id'] for case in second] == [1, 3]
@@ -0,0 +1,113 @@
+import asyncio
+import zlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+from app.modules.retriever import VectorRetriever
+
+
+class FakeEmbeddingModel:
+    max_chunk_tokens = 64
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.calls = 0
+
+    def _embed(self, text):
+        vector = np.random.default_rng(zlib.crc32(text.encode())).standard_normal(8)
+        return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+    def embed_text(self, text):
+        self.calls += 1
+        return self._embed(text)
+
+    def embed_texts(self, texts, batch_size=32):
+        return np.stack([self._embed(text) for text in texts])
+
+    async def aembed_text(self, text):
+        return self.embed_text(text)
+
+
+CASE = {
+    'id': 1,
+    'title': 'A v. B',
+    'citation': '(2020) 1 SCC 1',
+    'court': 'Supreme Court',
+    'judge': 'X',
+    'decision_date': '2020-01-01',
+    'year': '2020',
+    'text': ' '.join(f"word{i}" for i in range(100))
+}
+
+
+@pytest.fixture
+def retriever(tmp_path, tokenizer):
+    return VectorRetriever(
+        persist_directory=str(tmp_path / "vectorstore"),
+        embedding_model=FakeEmbeddingModel(tokenizer),
+        cache_size=2,
+        semantic_cache_size=4
+    )
+
+
+def test_exact_cache_evicts_least_recently_used(retriever):
+    docs = [{'text': 'doc'}]
+    retriever._cache_exact(('a', 5), docs)
+    retriever._cache_exact(('b', 5), docs)
+    assert retriever._get_exact(('a', 5)) == docs
+
+    retriever._cache_exact(('c', 5), docs)
+
+    assert retriever._get_exact(('a', 5)) == docs
+    assert retriever._get_exact(('b', 5)) is None
+    assert retriever._get_exact(('c', 5)) == docs
+
+
+def test_semantic_cache_only_matches_same_top_k(retriever):
+    docs = [{'text': 'doc'}]
+    query = retriever.embedding_model.embed_text("article 21")
+    retriever._cache_semantic(query, 5, docs)
+
+    assert retriever._semantic_lookup(query, 5) == docs
+    assert retriever._semantic_lookup(query, 3) is None
+    assert retriever._semantic_lookup(-query, 5) is None
+
+
+def test_semantic_cache_overwrites_oldest_slot(retriever):
+    queries = [retriever.embedding_model.embed_text(f"query {i}") for i in range(5)]
+    for i, query in enumerate(queries):
+        retriever._cache_semantic(query, 5, [{'text': str(i)}])
+
+    assert retriever._semantic_lookup(queries[0], 5) is None
+    assert retriever._semantic_lookup(queries[4], 5) == [{'text': '4'}]
+
+
+def test_retrieve_serves_repeat_queries_from_cache(retriever):
+    retriever.index_cases([CASE], chunk_size=20, chunk_overlap=5, min_chunk_chars=0)
+    model = retriever.embedding_model
+
+    first = retriever.retrieve("Word1 word2", top_k=2)
+    second = asyncio.run(retriever.aretrieve("  word1 WORD2 ", top_k=2))
+
+    assert first == second
+    assert len(first) == 2
+    assert model.calls == 1
+
+    retriever.retrieve("word1 word2", top_k=3)
+    assert model.calls == 2
+
+
+def test_index_cases_clears_caches(retriever):
+    retriever.index_cases([CASE], chunk_size=20, chunk_overlap=5, min_chunk_chars=0)
+    retriever.retrieve("word1", top_k=2)
+
+    retriever.index_cases([{**CASE, 'id': 2}], chunk_size=20, chunk_overlap=5, min_chunk_chars=0)
+
+    assert not retriever._exact_cache
+    assert not retriever._sem_cache_docs
+    retriever.retrieve("word1", top_k=2)
+    assert retriever.embedding_model.calls == 2
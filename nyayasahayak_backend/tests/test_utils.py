@@ -0,0 +1,175 @@
+import random
+
+import pytest
+
+from app.modules import utils
+from app.modules.utils import (
+    LEGAL_TERMS,
+    DocView,
+    chunk_text,
+    chunk_texts,
+    extract_case_summary,
+    extract_legal_keywords,
+    strip_boilerplate
+)
+
+
+def _words(n):
+    return ' '.join(f"w{i}" for i in range(n))
+
+
+@pytest.mark.parametrize("num_tokens", [1, 4, 5, 10, 11, 37])
+def test_chunk_texts_windows_cover_text_with_overlap(tokenizer, num_tokens):
+    chunk_size, overlap = 4, 1
+
+    [chunks] = chunk_texts([_words(num_tokens)], tokenizer, chunk_size=chunk_size, overlap=overlap)
+    windows = [chunk.split() for chunk in chunks]
+
+    assert all(len(window) <= chunk_size for window in windows)
+    assert windows[0][0] == "w0"
+    assert windows[-1][-1] == f"w{num_tokens - 1}"
+    for previous, current in zip(windows, windows[1:]):
+        assert len(previous) == chunk_size
+        assert previous[-overlap:] == current[:overlap]
+
+
+def test_chunk_texts_keeps_short_and_empty_texts(tokenizer):
+    chunks = chunk_texts(["", "  short text  "], tokenizer, chunk_size=4, overlap=1)
+
+    assert chunks == [[], ["short text"]]
+
+
+@pytest.mark.parametrize("chunk_size, overlap", [(10, 10), (10, 40), (10, -1)])
+def test_chunk_texts_rejects_invalid_overlap(tokenizer, chunk_size, overlap):
+    with pytest.raises(ValueError):
+        chunk_texts(["some text"], tokenizer, chunk_size=chunk_size, overlap=overlap)
+
+
+def test_doc_view_matches_str_input():
+    text = "The Supreme Court held that Article 21 applies.  A writ of Habeas Corpus was issued! " * 20
+    doc = DocView(text)
+
+    assert chunk_text(doc, chunk_size=30, overlap=8) == chunk_text(text, chunk_size=30, overlap=8)
+    assert extract_legal_keywords(doc) == extract_legal_keywords(text)
+    assert extract_case_summary(doc, max_length=25) == extract_case_summary(text, max_length=25)
+    assert extract_case_summary(doc, max_length=10_000) == text
+
+
+@pytest.mark.parametrize("line", [
+    "IN THE SUPREME COURT OF INDIA",
+    "IN THE HIGH COURT OF DELHI AT NEW DELHI",
+    "REPORTABLE",
+    "Non-Reportable",
+    "Page 3 of 45",
+    "Page 12",
+    "- 7 -",
+    "4 | Page",
+    "Indian Kanoon - http://indiankanoon.org/doc/1234567/",
+    "Signature Not Verified",
+    "Digitally signed by SOME OFFICER",
+    "Digitally signed by Neetu Sachdeva Date: 2023.05.10 16:24:32 IST",
+    "IN THE HIGH COURT OF JUDICATURE AT BOMBAY (ORIGINAL SIDE)",
+])
+def test_strip_boilerplate_removes_whole_noise_lines(line):
+    text = f"The appellant paid the amount\n  {line}  \nin terms of the agreement."
+
+    assert strip_boilerplate(text) == "The appellant paid the amount\nin terms of the agreement."
+
+
+@pytest.mark.parametrize("text", [
+    "The appellant paid Rs.\n2019\nin section 5",
+    "Amount due:\n50000\n",
+    "The case was heard IN THE SUPREME COURT OF INDIA last year",
+    "See Page 3 of the record",
+    "The facts are these.\nIn the High Court of Delhi, the appellant filed a writ petition challenging the detention order.\nThe appeal followed.",
+    "Digitally signed by the parties, the agreement of 2011 was binding on both.\nThe appeal followed.",
+    "in the high court of delhi the matter was listed\nbefore the bench",
+])
+def test_strip_boilerplate_keeps_judgment_text(text):
+    assert strip_boilerplate(text) == text.strip()
+
+
+def test_strip_boilerplate_collapses_blank_runs():
+    text = "Held:\n\n\nPage 2 of 9\n\n\nAppeal allowed."
+
+    assert strip_boilerplate(text) == "Held:\n\nAppeal allowed."
+
+
+def _reference_chunk_text(text, chunk_size, overlap):
+    chunks = []
+    current_chunk = []
+    current_length = 0
+
+    for sentence in utils._split_sentences(text):
+        sentence_length = len(sentence.split())
+
+        if current_length + sentence_length > chunk_size and current_chunk:
+            chunks.append(' '.join(current_chunk))
+
+            overlap_sentences = []
+            overlap_length = 0
+            for s in reversed(current_chunk):
+                s_length = len(s.split())
+                if overlap_length + s_length <= overlap:
+                    overlap_sentences.insert(0, s)
+                    overlap_length += s_length
+                else:
+                    break
+
+            current_chunk = overlap_sentences
+            current_length = overlap_length
+
+        current_chunk.append(sentence)
+        current_length += sentence_length
+
+    if current_chunk:
+        chunks.append(' '.join(current_chunk))
+
+    return chunks
+
+
+def _random_text(rng, max_words=120):
+    words = ['the', 'Court', 'held', 'Article', '21', 'writ', 'petition', 'a.b', '...', 'x']
+    separators = [' ', ' ', '. ', '! ', '? ', '.\n', '  ']
+    return ''.join(
+        rng.choice(words) + rng.choice(separators)
+        for _ in range(rng.randint(0, max_words))
+    )
+
+
+def test_chunk_text_matches_reference_windowing():
+    rng = random.Random(0)
+    for _ in range(500):
+        text = _random_text(rng)
+        chunk_size = rng.randint(1, 30)
+        overlap = rng.randint(0, chunk_size)
+
+        assert chunk_text(text, chunk_size, overlap) == _reference_chunk_text(text, chunk_size, overlap)
+
+
+def _force_backend(monkeypatch, backend):
+    if backend == "hyperscan" and utils._LEGAL_TERMS_DB is None:
+        pytest.skip("hyperscan is not installed")
+    if backend == "ahocorasick" and utils._LEGAL_TERMS_AUTOMATON is None:
+        pytest.skip("pyahocorasick is not installed")
+
+    if backend != "hyperscan":
+        monkeypatch.setattr(utils, "_LEGAL_TERMS_DB", None)
+    if backend == "regex":
+        monkeypatch.setattr(utils, "_LEGAL_TERMS_AUTOMATON", None)
+
+
+@pytest.mark.parametrize("backend", ["hyperscan", "ahocorasick", "regex"])
+def test_extract_legal_keywords_backends_match_substring_search(monkeypatch, backend):
+    _force_backend(monkeypatch, backend)
+    rng = random.Random(1)
+    vocabulary = list(LEGAL_TERMS) + ['Supreme', 'COURT', 'acts', 'highcourt', 'écrit', '\u00a0', 'the']
+
+    texts = ["", "nothing relevant here", ' '.join(LEGAL_TERMS).upper()] + [
+        ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 40)))
+        for _ in range(300)
+    ]
+
+    for text in texts:
+        expected = [term for term in LEGAL_TERMS if term in text.lower()]
+        assert extract_legal_keywords(text) == expected